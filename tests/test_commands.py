@@ -1,13 +1,26 @@
-"""Test cases for USC Signal Bot commands."""
+"""Test cases for USC Signal Bot commands.
 
+PYTEST_DONT_REWRITE: these tests only use unittest assertions.
+"""
+
+import asyncio
 import unittest
-from typing import List, Tuple
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from signalbot import Context
 
-from usc_signal_bot.commands import BookTimeslotCommand
+from usc_signal_bot.commands import (
+    TIMESLOTS_MESSAGE_PATTERN,
+    AliasesCommand,
+    BookTimeslotCommand,
+    GetTimeslotsCommand,
+    lowercase_aliases,
+    resolve_alias,
+)
 from usc_signal_bot.config import BookingMember, USCCreds
+from usc_signal_bot.usc import AMSTERDAM_TZ
 
 
 def create_test_creds(emails: List[str]) -> USCCreds:
@@ -27,9 +40,10 @@ def format_allocation(
 class TestBookingAllocation(unittest.TestCase):
     """Test cases for booking allocation logic."""
 
-    def setUp(self):
-        """Set up test cases."""
-        self.command = BookTimeslotCommand(
+    @classmethod
+    def setUpClass(cls):
+        """Set up the command shared by all test cases."""
+        cls.command = BookTimeslotCommand(
             create_test_creds(["john@usc.nl", "sarah@usc.nl", "mike@usc.nl"])
         )
 
@@ -154,17 +168,56 @@ class TestBookingAllocation(unittest.TestCase):
             "Members with credentials should book for themselves and others",
         )
 
+    def test_booking_members_without_guests_left(self):
+        """Test that booking members still get a court when all guests are allocated."""
+        members = ["john@usc.nl", "sarah@usc.nl", "mike@usc.nl", "alice@usc.nl"]
+        allocation = self._allocate(members, 3)
+        self.assertEqual(
+            allocation,
+            [
+                ("john@usc.nl", ["alice@usc.nl"]),
+                ("sarah@usc.nl", []),
+                ("mike@usc.nl", []),
+            ],
+            "Booking members should book for themselves when no guests are left",
+        )
+
+    def test_booking_member_email_is_case_insensitive(self):
+        """Test that booking members are recognized regardless of email case."""
+        allocation = self._allocate(["John@USC.nl", "alice@usc.nl"], 1)
+        self.assertEqual(
+            allocation,
+            [("john@usc.nl", ["alice@usc.nl"])],
+            "Booking member should be matched case insensitively and not invite themselves",
+        )
+
     def _allocate(self, members: List[str], courts: int) -> List[Tuple[str, List[str]]]:
         """Helper method to allocate bookings and format results."""
         return format_allocation(self.command._allocate_bookings(members, courts))
 
 
+class TestAliasResolution(unittest.TestCase):
+    """Test cases for alias resolution."""
+
+    def test_resolve_alias_case_insensitive(self):
+        """Test that aliases are resolved regardless of case."""
+        aliases = lowercase_aliases({"Alex": "alex@usc.nl"})
+        self.assertEqual(resolve_alias("alex", aliases), "alex@usc.nl")
+        self.assertEqual(resolve_alias("ALEX", aliases), "alex@usc.nl")
+
+    def test_resolve_unknown_alias(self):
+        """Test that unknown aliases are returned unchanged."""
+        aliases = lowercase_aliases({"alex": "alex@usc.nl"})
+        self.assertEqual(resolve_alias("Bob@usc.nl", aliases), "Bob@usc.nl")
+
+
 class TestArgumentParsing(unittest.TestCase):
     """Test cases for argument parsing."""
 
-    def setUp(self):
-        """Set up test cases."""
-        self.command = BookTimeslotCommand(
+    @classmethod
+    def setUpClass(cls):
+        """Set up the command shared by all test cases."""
+        cls.command = BookTimeslotCommand(
             create_test_creds(["john@usc.nl", "sarah@usc.nl", "mike@usc.nl"])
         )
 
@@ -197,6 +250,48 @@ class TestArgumentParsing(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.command._parse_args("book")  # Missing required arguments
 
+    def test_dry_run_flag_after_members(self):
+        """Test that the dry-run flag can also be given after the members."""
+        args = self.command._parse_args("book 1 2024-03-20 18:00 john@usc.nl --dry-run")
+        self.assertTrue(args.dry_run)  # type: ignore
+        self.assertEqual(args.members, ["john@usc.nl"])  # type: ignore
+
+    def test_missing_arguments_are_listed(self):
+        """Test that the error names the missing arguments and shows the usage."""
+        with self.assertRaises(RuntimeError) as cm:
+            self.command._parse_args("book 1 2024-03-20")
+        self.assertIn("the following arguments are required: time, members", str(cm.exception))
+        self.assertIn("usage: book", str(cm.exception))
+
+    def test_invalid_courts(self):
+        """Test that a non-numeric number of courts raises an error."""
+        with self.assertRaises(RuntimeError) as cm:
+            self.command._parse_args("book one 2024-03-20 18:00 john@usc.nl")
+        self.assertIn("invalid int value: 'one'", str(cm.exception))
+
+    def test_unknown_option(self):
+        """Test that unknown options raise an error."""
+        with self.assertRaises(RuntimeError) as cm:
+            self.command._parse_args("book --force 1 2024-03-20 18:00 john@usc.nl")
+        self.assertIn("unrecognized arguments: --force", str(cm.exception))
+
+    def test_abbreviated_dry_run(self):
+        """Test that --dry-run can be abbreviated like with argparse."""
+        for option in ("--dry", "--d"):
+            args = self.command._parse_args(f"book {option} 1 2024-03-20 18:00 john@usc.nl")
+            self.assertTrue(args.dry_run, option)  # type: ignore
+
+    def test_arguments_after_separator_are_positional(self):
+        """Test that arguments after -- are not parsed as options."""
+        args = self.command._parse_args("book 1 2024-03-20 18:00 -- --dry-run -john@usc.nl")
+        self.assertFalse(args.dry_run)  # type: ignore
+        self.assertEqual(args.members, ["--dry-run", "-john@usc.nl"])  # type: ignore
+
+    def test_negative_number_is_positional(self):
+        """Test that negative numbers are parsed as arguments instead of options."""
+        args = self.command._parse_args("book -1 2024-03-20 18:00 john@usc.nl")
+        self.assertEqual(args.courts, -1)  # type: ignore
+
     def test_quoted_emails(self):
         """Test handling of quoted email addresses."""
         args = self.command._parse_args(
@@ -205,20 +300,140 @@ class TestArgumentParsing(unittest.TestCase):
         self.assertIsNotNone(args, "Arguments should be parsed successfully")
         self.assertEqual(args.members, ["john@usc.nl", "user with spaces@usc.nl"])  # type: ignore
 
+    def test_single_quoted_emails(self):
+        """Test handling of single quoted email addresses."""
+        args = self.command._parse_args("book 1 2024-03-20 18:00 'user with spaces@usc.nl' bob")
+        self.assertIsNotNone(args, "Arguments should be parsed successfully")
+        self.assertEqual(args.members, ["user with spaces@usc.nl", "bob"])  # type: ignore
+
+    def test_unclosed_quote(self):
+        """Test that an unclosed quote raises an error instead of becoming part of an email."""
+        for members in ('"john@usc.nl', "john@usc.nl'"):
+            with self.assertRaises(RuntimeError) as cm:
+                self.command._parse_args(f"book 1 2024-03-20 18:00 {members}")
+            self.assertIn("No closing quotation", str(cm.exception))
+
+
+class TestTimeslotsMessagePattern(unittest.TestCase):
+    """Test cases for the timeslots message pattern."""
+
+    def test_lowercased_message_matches(self):
+        """Test that messages are matched after lowercasing."""
+        match = TIMESLOTS_MESSAGE_PATTERN.match("TimeSlots 2024-03-20".lower())
+        self.assertIsNotNone(match)
+        self.assertEqual(match.group(1).strip(), "2024-03-20")  # type: ignore
+
+    def test_date_is_optional(self):
+        """Test that the date can be omitted."""
+        match = TIMESLOTS_MESSAGE_PATTERN.match("timeslots")
+        self.assertIsNotNone(match)
+        self.assertIsNone(match.group(1))  # type: ignore
+
+    def test_invalid_date_format(self):
+        """Test that dates in other formats are rejected."""
+        self.assertIsNone(TIMESLOTS_MESSAGE_PATTERN.match("timeslots 20-03-2024"))
+
+
+class TestTimeslotsCommand(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the timeslots command handler."""
+
+    def setUp(self):
+        """Set up a fresh command and context mock for each test case."""
+        self.command = GetTimeslotsCommand(create_test_creds(["john@usc.nl"]))
+        self.context = MagicMock(spec=Context)
+        self.context.message = MagicMock(text="timeslots")
+        self.context.send = AsyncMock()
+
+    @patch("usc_signal_bot.commands.USCClient")
+    async def test_defaults_to_six_days_ahead(self, mock_usc_client):
+        """Test that slots are looked up for the day they are released by default."""
+        mock_client = AsyncMock()
+        mock_usc_client.return_value = mock_client
+        mock_client.format_slots = MagicMock(return_value={})
+
+        await self.command.handle(self.context)
+
+        date = mock_client.get_slots.call_args.args[0]
+        expected = datetime.now(AMSTERDAM_TZ) + timedelta(days=6)
+        self.assertLess(abs(date - expected), timedelta(minutes=1))
+        self.context.send.assert_called_once_with(
+            f"No available slots found for **{date.strftime('%A %Y-%m-%d')}**", text_mode="styled"
+        )
+
+
+class TestAliasesCommand(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the aliases command handler."""
+
+    def setUp(self):
+        """Set up a fresh context mock for each test case."""
+        self.context = MagicMock(spec=Context)
+        self.context.message = MagicMock(text="aliases")
+        self.context.send = AsyncMock()
+
+    async def test_aliases_are_sorted(self):
+        """Test that the configured aliases are listed alphabetically."""
+        command = AliasesCommand(
+            USCCreds(bookingMembers=[], aliases={"sarah": "sarah@usc.nl", "john": "john@usc.nl"})
+        )
+        await command.handle(self.context)
+        self.context.send.assert_called_once_with(
+            "Configured aliases:\n- **john** → john@usc.nl\n- **sarah** → sarah@usc.nl",
+            text_mode="styled",
+        )
+
+    async def test_no_aliases(self):
+        """Test the response when no aliases are configured."""
+        await AliasesCommand(USCCreds(bookingMembers=[])).handle(self.context)
+        self.context.send.assert_called_once_with("No aliases configured.")
 
-@patch("usc_signal_bot.commands.parse")
-class TestBookingCommand(unittest.TestCase):
+
+class TestBookingCommand(unittest.IsolatedAsyncioTestCase):
     """Test cases for the booking command handler."""
 
     def setUp(self):
-        """Set up test cases."""
+        """Set up a fresh command, context mock and mocked USC client for each test case."""
+        # The command keeps its USC clients between messages, so it isn't shared between tests
         self.command = BookTimeslotCommand(
             create_test_creds(["john@usc.nl", "sarah@usc.nl", "mike@usc.nl"])
         )
         self.context = MagicMock(spec=Context)
+        # message is an instance attribute, so it isn't part of the Context spec
+        self.context.message = MagicMock()
         self.context.send = AsyncMock()
 
-    async def test_help_message(self, mock_parse):
+        self.mock_parse = self.start_patch("usc_signal_bot.commands.parse_date")
+        self.mock_parse.return_value = "2024-03-20 18:00"
+        # Every booking member gets the same mocked client, which books successfully
+        self.mock_usc_client = self.start_patch("usc_signal_bot.commands.USCClient")
+        self.mock_client = self.mock_usc_client.return_value = AsyncMock()
+        self.mock_client.get_member.return_value = MagicMock(id=123)
+        self.mock_client.create_booking_data = MagicMock()
+
+    def start_patch(self, target: str) -> MagicMock:
+        """Patch target until the test case is done."""
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    async def book(
+        self,
+        *members: str,
+        courts: int = 1,
+        dry_run: bool = False,
+        command: Optional[BookTimeslotCommand] = None,
+    ) -> None:
+        """Send a book message for the members, with an available slot for every court."""
+        self.mock_client.get_slots_for_booking.return_value = [
+            MagicMock(startDate=datetime(2024, 3, 20, 18), endDate=datetime(2024, 3, 20, 19))
+            for _ in range(courts)
+        ]
+        dry_run_option = "--dry-run " if dry_run else ""
+        self.context.message.text = (
+            f"book {dry_run_option}{courts} 2024-03-20 18:00 {' '.join(members)}"
+        )
+        await (command or self.command).handle(self.context)
+
+    async def test_help_message(self):
         """Test help message is shown."""
         self.context.message.text = "book --help"
         await self.command.handle(self.context)
@@ -226,53 +441,171 @@ class TestBookingCommand(unittest.TestCase):
         help_text = self.context.send.call_args[0][0]
         self.assertIn("Book a timeslot at USC", help_text)
 
-    @patch("usc_signal_bot.commands.USCClient")
-    async def test_dry_run_booking(self, mock_usc_client, mock_parse):
-        """Test dry run booking shows what would be booked."""
-        # Setup mocks
-        mock_parse.return_value = "2024-03-20 18:00"
-        mock_client = AsyncMock()
-        mock_usc_client.return_value = mock_client
-        mock_client.get_matching_slot.return_value = MagicMock(
-            startDate="2024-03-20 18:00", endDate="2024-03-20 19:00"
-        )
-        mock_client.get_member.return_value = MagicMock(id=123)
+    async def test_command_is_case_insensitive(self):
+        """Test that the command name is matched case insensitively."""
+        self.context.message.text = "BOOK --help"
+        await self.command.handle(self.context)
+        self.context.send.assert_called_once()
 
-        # Test dry run
-        self.context.message.text = "book --dry-run 2024-03-20 18:00 john@usc.nl alice@usc.nl"
+    async def test_unrelated_message_is_ignored(self):
+        """Test that messages not starting with the command are ignored."""
+        self.context.message.text = "let's book --help"
         await self.command.handle(self.context)
+        self.context.send.assert_not_called()
+
+    async def test_unexpected_error_is_reported(self):
+        """Test that unexpected errors are reported in the chat."""
+        self.mock_parse.side_effect = TypeError("unexpected")
+        with self.assertLogs(level="ERROR"):
+            await self.book("john@usc.nl")
+        self.context.send.assert_called_once_with("Error in handle: unexpected")
+
+    async def test_cancellation_is_not_reported(self):
+        """Test that a cancelled booking propagates instead of being sent as an error."""
+        self.mock_client.authenticate.side_effect = asyncio.CancelledError
+
+        with self.assertRaises(asyncio.CancelledError):
+            await self.book("john@usc.nl")
+        self.context.send.assert_not_called()
+
+    async def test_dry_run_booking(self):
+        """Test dry run booking shows what would be booked."""
+        await self.book("john@usc.nl", "alice@usc.nl", dry_run=True)
 
-        # Verify
         self.context.send.assert_called_once()
         response = self.context.send.call_args[0][0]
         self.assertIn("[DRY RUN]", response)
         self.assertIn("Would book slot", response)
         # Verify no actual booking was made
-        mock_client.book_slot.assert_not_called()
+        self.mock_client.book_slot.assert_not_called()
 
-    @patch("usc_signal_bot.commands.USCClient")
-    async def test_actual_booking(self, mock_usc_client, mock_parse):
+    async def test_actual_booking(self):
         """Test actual booking makes the API call."""
-        # Setup mocks
-        mock_parse.return_value = "2024-03-20 18:00"
-        mock_client = AsyncMock()
-        mock_usc_client.return_value = mock_client
-        mock_client.get_matching_slot.return_value = MagicMock(
-            startDate="2024-03-20 18:00", endDate="2024-03-20 19:00"
-        )
-        mock_client.get_member.return_value = MagicMock(id=123)
-
-        # Test actual booking
-        self.context.message.text = "book 2024-03-20 18:00 john@usc.nl alice@usc.nl"
-        await self.command.handle(self.context)
+        await self.book("john@usc.nl", "alice@usc.nl")
 
-        # Verify
         self.context.send.assert_called_once()
         response = self.context.send.call_args[0][0]
         self.assertNotIn("[DRY RUN]", response)
         self.assertIn("Booking successful", response)
         # Verify booking was made
-        mock_client.book_slot.assert_called_once()
+        self.mock_client.book_slot.assert_called_once()
+
+    async def test_clients_are_reused_between_messages(self):
+        """Test that booking members only authenticate again when their token expired."""
+        self.mock_client.needs_authentication = True
+
+        async def authenticate(username: str, password: str):
+            self.mock_client.needs_authentication = False
+
+        self.mock_client.authenticate.side_effect = authenticate
+
+        await self.book("john@usc.nl")
+        await self.book("john@usc.nl")
+
+        self.assertEqual(self.context.send.call_args[0][0].count("Booking successful"), 1)
+        self.mock_usc_client.assert_called_once()
+        self.mock_client.authenticate.assert_awaited_once_with("john@usc.nl", "pass_john@usc.nl")
+        self.assertEqual(self.mock_client.book_slot.await_count, 2)
+
+    async def test_booking_results_are_sent_as_they_complete(self):
+        """Test that every booking result is sent on its own."""
+        await self.book("john@usc.nl", "sarah@usc.nl", courts=2)
+
+        responses = sorted(call.args[0] for call in self.context.send.call_args_list)
+        self.assertEqual(
+            responses,
+            [
+                "Booking successful with john@usc.nl for members ",
+                "Booking successful with sarah@usc.nl for members ",
+            ],
+        )
+
+    async def test_uses_shared_http_client(self):
+        """Test that the HTTP client shared by the bot is used for bookings."""
+        http_client = MagicMock()
+        command = BookTimeslotCommand(create_test_creds(["john@usc.nl"]), http_client)
+
+        await self.book("john@usc.nl", command=command)
+
+        self.mock_usc_client.assert_called_once_with(http_client=http_client)
+        self.assertIn("Booking successful", self.context.send.call_args[0][0])
+
+    async def test_member_id_is_fetched_once(self):
+        """Test that the member id of a booking member is reused for later bookings."""
+        await self.book("john@usc.nl")
+        await self.book("john@usc.nl")
+
+        self.assertEqual(self.context.send.call_count, 2)
+        self.mock_client.get_member.assert_awaited_once()
+        self.assertEqual(self.mock_client.create_booking_data.call_args.args[0], 123)
+
+    async def test_member_id_is_fetched_with_slots(self):
+        """Test that the first member id is fetched while the slots are looked up."""
+        member_requested = asyncio.Event()
+        slot = MagicMock(startDate=datetime(2024, 3, 20, 18), endDate=datetime(2024, 3, 20, 19))
+
+        async def get_member():
+            member_requested.set()
+            return MagicMock(id=123)
+
+        async def get_slots_for_booking(date, num_slots):
+            # Only returns once the member id is being fetched at the same time
+            await asyncio.wait_for(member_requested.wait(), timeout=1)
+            return [slot]
+
+        self.mock_client.get_member.side_effect = get_member
+        self.mock_client.get_slots_for_booking.side_effect = get_slots_for_booking
+
+        await self.book("john@usc.nl")
+
+        self.mock_client.get_member.assert_awaited_once()
+        self.assertEqual(self.mock_client.create_booking_data.call_args.args[0], 123)
+        self.assertIn("Booking successful", self.context.send.call_args.args[0])
+
+    async def test_aclose_closes_cached_clients(self):
+        """Test that closing the command closes the USC clients of the booking members."""
+        usc = AsyncMock()
+        self.command._clients["john@usc.nl"] = usc
+
+        await self.command.aclose()
+
+        usc.close.assert_awaited_once()
+        self.assertEqual(self.command._clients, {})
+
+    async def test_member_id_failure_only_fails_that_booking(self):
+        """Test that a failed member id lookup only fails the booking of that member."""
+        # The first lookup is the prefetch for john, the first booking member
+        self.mock_client.get_member.side_effect = [
+            RuntimeError("Error getting member"),
+            MagicMock(id=1),
+            MagicMock(id=2),
+        ]
+
+        await self.book("john@usc.nl", "sarah@usc.nl", "mike@usc.nl", courts=3)
+
+        responses = sorted(call.args[0] for call in self.context.send.call_args_list)
+        self.assertEqual(
+            responses,
+            [
+                "Booking failed with john@usc.nl: Error getting member",
+                "Booking successful with mike@usc.nl for members ",
+                "Booking successful with sarah@usc.nl for members ",
+            ],
+        )
+        # The failed lookup isn't retried by john's booking
+        self.assertEqual(self.mock_client.get_member.await_count, 3)
+        self.assertEqual(self.mock_client.book_slot.await_count, 2)
+
+    async def test_member_id_failure_in_dry_run(self):
+        """Test that a failed member id lookup is reported as a failed dry run booking."""
+        self.mock_client.get_member.side_effect = RuntimeError("Error getting member")
+
+        await self.book("john@usc.nl", dry_run=True)
+
+        self.mock_client.get_member.assert_awaited_once()
+        self.context.send.assert_called_once_with(
+            "[DRY RUN] Booking failed with john@usc.nl: Error getting member", text_mode="styled"
+        )
 
 
 if __name__ == "__main__":
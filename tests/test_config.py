@@ -0,0 +1,60 @@
+"""Test cases for loading the bot config."""
+
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from usc_signal_bot.bot import _load_config_uncached, load_config
+
+CONFIG = """
+bot:
+  signal_service: "signal-api:8080"
+  phone_number: "+1234567890"
+commands:
+  - name: ping
+usc:
+  bookingMembers:
+    - username: "{username}"
+      password: "password"
+"""
+
+
+def write_config(path: Path, username: str) -> None:
+    """Write a minimal config file with a single booking member."""
+    path.write_text(CONFIG.format(username=username))
+
+
+@pytest.fixture
+def config_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Point CONFIG_FILE at a config file in a temporary directory."""
+    path = tmp_path / "config.yaml"
+    write_config(path, "john@usc.nl")
+    monkeypatch.setenv("CONFIG_FILE", str(path))
+    _load_config_uncached.cache_clear()
+    yield path
+    _load_config_uncached.cache_clear()
+
+
+def test_load_config_is_cached(config_file: Path):
+    """Test that loading an unchanged config file returns the cached config."""
+    config = load_config()
+
+    assert config.usc.bookingMembers[0].username == "john@usc.nl"
+    assert load_config() is config
+    assert _load_config_uncached.cache_info().misses == 1
+
+
+def test_load_config_reloads_modified_file(config_file: Path):
+    """Test that the config is loaded again when the config file is modified."""
+    config = load_config()
+
+    write_config(config_file, "sarah@usc.nl")
+    # Set the mtime explicitly, the rewrite may happen within the filesystem's mtime resolution
+    mtime = config_file.stat().st_mtime + 10
+    os.utime(config_file, (mtime, mtime))
+
+    reloaded = load_config()
+    assert reloaded is not config
+    assert reloaded.usc.bookingMembers[0].username == "sarah@usc.nl"
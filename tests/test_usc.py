@@ -0,0 +1,188 @@
+"""Test cases for USC API client helpers."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from usc_signal_bot.usc import (
+    AMSTERDAM_TZ,
+    UTC_TZ,
+    Auth,
+    BookableSlot,
+    USCClient,
+    _parse_ams_date,
+    _to_dict_key,
+    format_slot_date,
+    parse_date,
+)
+
+AUTH = Auth(
+    access_token="token",
+    token_type="Bearer",
+    refresh_token="refresh",
+    scope="scope",
+    id_token="id",
+    expires_in="3600",
+)
+
+
+@pytest.mark.parametrize(
+    ("date", "expected"),
+    [
+        ("2024-03-20", datetime(2024, 3, 20)),
+        ("2024-03-20 18:00", datetime(2024, 3, 20, 18)),
+        (" 2024-03-20 18:00 ", datetime(2024, 3, 20, 18)),
+        ("2024-03-20 8:00", datetime(2024, 3, 20, 8)),
+        ("2024-03-20T18:00:00Z", datetime(2024, 3, 20, 18, tzinfo=UTC_TZ)),
+    ],
+)
+def test_parse_date_chat_formats_skip_dateparser(date: str, expected: datetime):
+    """Test that dates in the chat formats are parsed without dateparser."""
+    with patch("dateparser.parse") as mock_parse:
+        assert parse_date(date) == expected
+    mock_parse.assert_not_called()
+
+
+def test_parse_date_natural_language():
+    """Test that natural language dates fall back to dateparser."""
+    parsed = parse_date("6 days later")
+    assert parsed is not None
+    assert abs(parsed - (datetime.now() + timedelta(days=6))) < timedelta(minutes=1)
+
+
+@pytest.mark.parametrize(
+    "date",
+    ["2024-03-20 18:00", datetime(2024, 3, 20, 18), datetime(2024, 3, 20, 17, tzinfo=UTC_TZ)],
+)
+def test_parse_ams_date(date: str | datetime):
+    """Test that dates are returned in the Amsterdam timezone."""
+    parsed = _parse_ams_date(date)
+    assert parsed == datetime(2024, 3, 20, 18, tzinfo=AMSTERDAM_TZ)
+    assert parsed.tzinfo is AMSTERDAM_TZ
+
+
+def test_parse_date_invalid():
+    """Test that unparseable dates return None."""
+    assert parse_date("not a date") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("expires_in", "expected"), [("3600", False), ("30", True), ("", True)])
+async def test_needs_authentication_after_token_expiry(expires_in: str, expected: bool):
+    """Test that clients authenticate again when their token (almost) expired."""
+    auth_payload = {
+        "access_token": "token",
+        "token_type": "Bearer",
+        "refresh_token": "refresh",
+        "scope": "scope",
+        "id_token": "id",
+        "expires_in": expires_in,
+    }
+    client = USCClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=auth_payload))
+    )
+    assert client.needs_authentication
+
+    await client.authenticate("test@usc.nl", "password")
+    assert client.needs_authentication is expected
+    await client.close()
+
+
+def test_format_slots_filters_and_groups_slots():
+    """Test that slots are grouped by Amsterdam start time within the bookable hours."""
+
+    def slot(start: datetime, available: bool = True, product_id: int = 1) -> BookableSlot:
+        return BookableSlot(
+            startDate=start,
+            endDate=start + timedelta(minutes=45),
+            isAvailable=available,
+            linkedProductId=1,
+            bookableProductId=product_id,
+        )
+
+    slots = [
+        slot(datetime(2024, 3, 20, 17, tzinfo=UTC_TZ), product_id=1),
+        slot(datetime(2024, 3, 20, 8, tzinfo=UTC_TZ)),  # 09:00 in Amsterdam, too early
+        slot(datetime(2024, 3, 20, 17, tzinfo=UTC_TZ), available=False),
+        slot(datetime(2024, 3, 20, 17, tzinfo=UTC_TZ), product_id=2),
+        slot(datetime(2024, 3, 20, 9, tzinfo=UTC_TZ)),
+    ]
+
+    client = USCClient(http_client=MagicMock(spec=httpx.AsyncClient))
+    grouped = client.format_slots(slots)
+
+    assert list(grouped) == ["2024-03-20 10:00", "2024-03-20 18:00"]
+    assert [s.bookableProductId for s in grouped["2024-03-20 18:00"]] == [1, 2]
+    assert grouped["2024-03-20 18:00"][0].startDate.tzinfo is AMSTERDAM_TZ
+    # The slots returned by the API are left untouched
+    assert slots[0].startDate.tzinfo is UTC_TZ
+
+
+@pytest.mark.asyncio
+async def test_book_slot_sends_booking_data_as_json():
+    """Test that the booking data is sent as the JSON request body."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"id": 1})
+
+    client = USCClient(transport=httpx.MockTransport(handler))
+    client.auth = AUTH
+    start = datetime(2024, 3, 20, 18, tzinfo=AMSTERDAM_TZ)
+    slot = BookableSlot(
+        startDate=start,
+        endDate=start + timedelta(minutes=45),
+        isAvailable=True,
+        linkedProductId=456,
+        bookableProductId=123,
+    )
+
+    assert await client.book_slot(client.create_booking_data(1, ["john@usc.nl"], slot)) == {"id": 1}
+    await client.close()
+
+    body = json.loads(requests[0].content)
+    assert requests[0].headers["Content-Type"] == "application/json"
+    assert requests[0].headers["Authorization"] == "Bearer token"
+    assert body["memberId"] == 1
+    assert body["params"]["startDate"] == "2024-03-20T17:00:00.000Z"
+    assert body["params"]["invitedMemberEmails"] == ["john@usc.nl"]
+    assert body["params"]["invitedGuests"] == []
+    assert body["params"]["invitedOthers"] == []
+
+
+@pytest.mark.parametrize(
+    "date", [datetime(2024, 3, 5, 8, 7), datetime(2024, 12, 31, 23, 59, tzinfo=AMSTERDAM_TZ)]
+)
+def test_slot_date_formatting_matches_strftime(date: datetime):
+    """Test that slot dates are formatted like strftime("%Y-%m-%d %H:%M")."""
+    assert format_slot_date(date) == date.strftime("%Y-%m-%d %H:%M")
+    assert _to_dict_key(date) == date.strftime("%Y-%m-%d %H:%M")
+
+
+@pytest.mark.asyncio
+async def test_get_slots_query_params():
+    """Test that the slots filter is sent for the requested date in UTC."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json={"data": [], "page": 1, "count": 0, "total": 0, "pageCount": 0}
+        )
+
+    client = USCClient(transport=httpx.MockTransport(handler))
+    client.auth = AUTH
+    await client.get_slots(datetime(2024, 3, 20, 18, tzinfo=AMSTERDAM_TZ))
+    await client.close()
+
+    params = requests[0].url.params
+    assert json.loads(params["s"]) == {
+        "startDate": "2024-03-20T10:00:00.000Z",
+        "endDate": "2024-03-20T19:00:00.000Z",
+        "tagIds": {"$in": [195]},
+    }
+    assert json.loads(params["join"]) == ["linkedProduct", "product"]
@@ -1,146 +1,209 @@
 """Test cases for USC API client retry behavior."""
 
+import asyncio
+import json
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+from typing import Any, Callable, Iterator
 
 import httpx
 import pytest
 
-from usc_signal_bot.usc import AMSTERDAM_TZ, USCClient
+from usc_signal_bot.usc import AMSTERDAM_TZ, Auth, USCClient, _is_retryable_error
+
+AUTH_PAYLOAD = {
+    "access_token": "token",
+    "token_type": "Bearer",
+    "refresh_token": "refresh",
+    "scope": "scope",
+    "id_token": "id",
+    "expires_in": "3600",
+}
+# Success payloads are serialized once; httpx binds every response to its request,
+# so only the cheap Response wrapper is created per attempt.
+AUTH_CONTENT = json.dumps(AUTH_PAYLOAD).encode()
+AUTH = Auth(**AUTH_PAYLOAD)
+
+
+def json_response(content: bytes) -> httpx.Response:
+    """Create a successful response for pre-serialized JSON content."""
+    return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+
+def slot_payload(linked_product_id: int | None, **extra: Any) -> dict[str, Any]:
+    """Create a raw bookable slot as returned by the USC API."""
+    return {
+        "startDate": "2024-03-20T17:30:00.000Z",
+        "endDate": "2024-03-20T19:00:00.000Z",
+        "isAvailable": True,
+        "linkedProductId": linked_product_id,
+        "bookableProductId": 123,
+        **extra,
+    }
+
+
+def slots_response_payload(slots: list[dict[str, Any]]) -> dict[str, Any]:
+    """Wrap raw slots in a bookable slots response."""
+    return {
+        "data": slots,
+        "page": 1,
+        "count": len(slots),
+        "total": len(slots),
+        "pageCount": 1 if slots else 0,
+    }
+
+
+class HandlerTransport(httpx.MockTransport):
+    """Mock transport whose request handler can be swapped between tests."""
+
+    def __init__(self) -> None:
+        super().__init__(self._dispatch)
+        self.handler: Callable[[httpx.Request], httpx.Response] | None = None
+
+    def _dispatch(self, request: httpx.Request) -> httpx.Response:
+        assert self.handler is not None, "No request handler configured for this test"
+        return self.handler(request)
+
+
+def http_status_error(status_code: int) -> httpx.HTTPStatusError:
+    """Create an HTTPStatusError backed by a real request and response."""
+    request = httpx.Request("POST", "https://example.com/auth")
+    response = httpx.Response(status_code, request=request, text="Error")
+    return httpx.HTTPStatusError("Error", request=request, response=response)
+
+
+def wrapped_error(cause: Exception) -> RuntimeError:
+    """Wrap an exception the way the USC client does when raising errors."""
+    try:
+        raise RuntimeError("Error calling USC") from cause
+    except RuntimeError as e:
+        return e
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected"),
+    [
+        (http_status_error(400), True),
+        (http_status_error(500), True),
+        (http_status_error(302), False),
+        (http_status_error(401), False),
+        (wrapped_error(http_status_error(403)), False),
+        (wrapped_error(http_status_error(429)), True),
+        (wrapped_error(ValueError("not an API error")), False),
+        (httpx.ConnectError("Connection failed"), True),
+        (RuntimeError("Not authenticated"), False),
+    ],
+)
+def test_is_retryable_error(exception: Exception, expected: bool):
+    """Test which exceptions are considered retryable."""
+    assert _is_retryable_error(exception) is expected
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip the exponential backoff waits between retry attempts."""
+
+    async def no_sleep(seconds: float) -> None:
+        pass
+
+    # tenacity looks up asyncio.sleep at call time for async retries
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+
+@pytest.fixture(scope="class")
+def transport() -> HandlerTransport:
+    """Create the mock transport shared by all tests in a class."""
+    return HandlerTransport()
+
+
+@pytest.fixture(scope="class")
+def client(transport: HandlerTransport) -> Iterator[USCClient]:
+    """Create a USC client shared by all tests in a class.
+
+    Sharing the client between the event loops of the tests, and closing it in a loop of
+    its own, only works because the mock transport keeps no connections. Tests against a
+    real transport need a client per test.
+    """
+    client = USCClient(transport=transport)
+    yield client
+    asyncio.run(client.close())
+
+
+@pytest.fixture
+def set_handler(
+    client: USCClient, transport: HandlerTransport
+) -> Iterator[Callable[..., USCClient]]:
+    """Point the shared USC client at a request handler for a single test."""
+
+    def _set_handler(
+        handler: Callable[[httpx.Request], httpx.Response], authenticated: bool = False
+    ) -> USCClient:
+        transport.handler = handler
+        client.auth = AUTH if authenticated else None
+        return client
+
+    yield _set_handler
+    transport.handler = None
+    client.auth = None
 
 
 @pytest.mark.asyncio
 class TestUSCRetryBehavior:
     """Test cases for retry behavior on HTTP errors."""
 
-    @pytest.fixture
-    def client(self):
-        """Create a USC client instance."""
-        return USCClient()
-
-    async def test_retry_on_400_error(self, client):
+    async def test_retry_on_400_error(self, set_handler):
         """Test that API calls retry on 400 Bad Request."""
-        # Mock the httpx client to raise 400 error twice, then succeed
         call_count = 0
 
-        async def mock_post(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
             if call_count < 3:
                 # First two calls fail with 400
-                response.status_code = 400
-                response.text = "Bad Request"
-                # Create a proper HTTPStatusError with a response
-                request = MagicMock()
-                request.url = "https://example.com/auth"
-                error_response = MagicMock()
-                error_response.status_code = 400
-                error_response.text = "Bad Request"
-                error_response.request = request
-                error = httpx.HTTPStatusError(
-                    "Bad Request", request=request, response=error_response
-                )
-                response.raise_for_status.side_effect = error
-            else:
-                # Third call succeeds
-                response.status_code = 200
-                response.json.return_value = {
-                    "access_token": "token",
-                    "token_type": "Bearer",
-                    "refresh_token": "refresh",
-                    "scope": "scope",
-                    "id_token": "id",
-                    "expires_in": "3600",
-                }
-                response.raise_for_status.return_value = None
-            return response
-
-        client.client.post = AsyncMock(side_effect=mock_post)
+                return httpx.Response(400, text="Bad Request")
+            # Third call succeeds
+            return json_response(AUTH_CONTENT)
+
+        client = set_handler(handler)
 
         # Should succeed after retries
         result = await client.authenticate("test@usc.nl", "password")
         assert result is not None
         assert call_count == 3, f"Should retry twice then succeed, but got {call_count} calls"
 
-    async def test_retry_on_429_rate_limit(self, client):
+    async def test_retry_on_429_rate_limit(self, set_handler):
         """Test that API calls retry on 429 Rate Limit."""
         call_count = 0
 
-        async def mock_get(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
             if call_count < 2:
                 # First call fails with 429
-                response.status_code = 429
-                response.text = "Too Many Requests"
-                request = MagicMock()
-                request.url = "https://example.com/auth"
-                error_response = MagicMock()
-                error_response.status_code = 429
-                error_response.text = "Too Many Requests"
-                error_response.request = request
-                error = httpx.HTTPStatusError(
-                    "Too Many Requests", request=request, response=error_response
-                )
-                response.raise_for_status.side_effect = error
-            else:
-                # Second call succeeds
-                response.status_code = 200
-                response.json.return_value = {"id": 123, "email": "test@usc.nl"}
-                response.raise_for_status.return_value = None
-            return response
-
-        client.client.get = AsyncMock(side_effect=mock_get)
-        client.auth = MagicMock()
-        client.auth.token_type = "Bearer"
-        client.auth.access_token = "token"
+                return httpx.Response(429, text="Too Many Requests")
+            # Second call succeeds
+            return httpx.Response(200, json={"id": 123, "email": "test@usc.nl"})
+
+        client = set_handler(handler, authenticated=True)
 
         # Should succeed after retry
         result = await client.get_member()
         assert result is not None
         assert call_count == 2, f"Should retry once then succeed, but got {call_count} calls"
 
-    async def test_retry_on_500_server_error(self, client):
+    async def test_retry_on_500_server_error(self, set_handler):
         """Test that API calls retry on 500 Internal Server Error."""
         call_count = 0
 
-        async def mock_get(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
             if call_count < 3:
                 # First two calls fail with 500
-                response.status_code = 500
-                response.text = "Internal Server Error"
-                request = MagicMock()
-                request.url = "https://example.com/bookable-slots"
-                error_response = MagicMock()
-                error_response.status_code = 500
-                error_response.text = "Internal Server Error"
-                error_response.request = request
-                error = httpx.HTTPStatusError(
-                    "Internal Server Error", request=request, response=error_response
-                )
-                response.raise_for_status.side_effect = error
-            else:
-                # Third call succeeds
-                response.status_code = 200
-                response.json.return_value = {
-                    "data": [],
-                    "page": 1,
-                    "count": 0,
-                    "total": 0,
-                    "pageCount": 0,
-                }
-                response.raise_for_status.return_value = None
-            return response
-
-        client.client.get = AsyncMock(side_effect=mock_get)
-        client.auth = MagicMock()
-        client.auth.token_type = "Bearer"
-        client.auth.access_token = "token"
+                return httpx.Response(500, text="Internal Server Error")
+            # Third call succeeds
+            return httpx.Response(200, json=slots_response_payload([]))
+
+        client = set_handler(handler, authenticated=True)
 
         # Should succeed after retries
         date = datetime.now(AMSTERDAM_TZ)
@@ -148,54 +211,33 @@ class TestUSCRetryBehavior:
         assert result is not None
         assert call_count == 3, f"Should retry twice then succeed, but got {call_count} calls"
 
-    async def test_no_retry_on_success(self, client):
+    async def test_no_retry_on_success(self, set_handler):
         """Test that successful API calls don't retry."""
         call_count = 0
 
-        async def mock_post(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
-            response.status_code = 200
-            response.json.return_value = {
-                "access_token": "token",
-                "token_type": "Bearer",
-                "refresh_token": "refresh",
-                "scope": "scope",
-                "id_token": "id",
-                "expires_in": "3600",
-            }
-            return response
-
-        client.client.post = AsyncMock(side_effect=mock_post)
+            return json_response(AUTH_CONTENT)
+
+        client = set_handler(handler)
 
         # Should succeed without retries
         result = await client.authenticate("test@usc.nl", "password")
         assert result is not None
         assert call_count == 1, "Should not retry on success"
 
-    async def test_max_retries_exceeded(self, client):
+    async def test_max_retries_exceeded(self, set_handler):
         """Test that API calls fail after maximum retries."""
         call_count = 0
 
-        async def mock_post(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
             # Always fail with 400
-            response = MagicMock()
-            response.status_code = 400
-            response.text = "Bad Request"
-            request = MagicMock()
-            request.url = "https://example.com/auth"
-            error_response = MagicMock()
-            error_response.status_code = 400
-            error_response.text = "Bad Request"
-            error_response.request = request
-            error = httpx.HTTPStatusError("Bad Request", request=request, response=error_response)
-            response.raise_for_status.side_effect = error
-            return response
-
-        client.client.post = AsyncMock(side_effect=mock_post)
+            return httpx.Response(400, text="Bad Request")
+
+        client = set_handler(handler)
 
         # Should fail after max retries (4 attempts total)
         with pytest.raises(RuntimeError):
@@ -204,87 +246,40 @@ class TestUSCRetryBehavior:
             call_count == 4
         ), f"Should attempt 4 times before giving up, but got {call_count} calls"
 
-    async def test_retry_on_network_error(self, client):
+    async def test_retry_on_network_error(self, set_handler):
         """Test that API calls retry on network errors."""
         call_count = 0
 
-        async def mock_post(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
             if call_count < 2:
                 # First call fails with network error
-                raise httpx.NetworkError("Connection failed")
-            else:
-                # Second call succeeds
-                response = MagicMock()
-                response.status_code = 200
-                response.json.return_value = {
-                    "access_token": "token",
-                    "token_type": "Bearer",
-                    "refresh_token": "refresh",
-                    "scope": "scope",
-                    "id_token": "id",
-                    "expires_in": "3600",
-                }
-                return response
-
-        client.client.post = AsyncMock(side_effect=mock_post)
+                raise httpx.NetworkError("Connection failed", request=request)
+            # Second call succeeds
+            return json_response(AUTH_CONTENT)
+
+        client = set_handler(handler)
 
         # Should succeed after retry
         result = await client.authenticate("test@usc.nl", "password")
         assert result is not None
         assert call_count == 2, "Should retry once then succeed"
 
-    async def test_retry_on_validation_error(self, client):
+    async def test_retry_on_validation_error(self, set_handler):
         """Test that API calls retry on Pydantic ValidationError (invalid data)."""
         call_count = 0
 
-        async def mock_get(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
-            response.status_code = 200
-            response.raise_for_status.return_value = None
             if call_count < 3:
                 # First two calls return invalid data (linkedProductId is None)
-                response.json.return_value = {
-                    "data": [
-                        {
-                            "startDate": "2024-03-20T17:30:00.000Z",
-                            "endDate": "2024-03-20T19:00:00.000Z",
-                            "isAvailable": True,
-                            "linkedProductId": None,  # Invalid - should be int
-                            "bookableProductId": 123,
-                        }
-                    ],
-                    "page": 1,
-                    "count": 1,
-                    "total": 1,
-                    "pageCount": 1,
-                }
-            else:
-                # Third call returns valid data
-                response.json.return_value = {
-                    "data": [
-                        {
-                            "startDate": "2024-03-20T17:30:00.000Z",
-                            "endDate": "2024-03-20T19:00:00.000Z",
-                            "isAvailable": True,
-                            "linkedProductId": 456,  # Valid
-                            "bookableProductId": 123,
-                        }
-                    ],
-                    "page": 1,
-                    "count": 1,
-                    "total": 1,
-                    "pageCount": 1,
-                }
-            return response
-
-        client.client.get = AsyncMock(side_effect=mock_get)
-        client.auth = MagicMock()
-        client.auth.token_type = "Bearer"
-        client.auth.access_token = "token"
+                return httpx.Response(200, json=slots_response_payload([slot_payload(None)]))
+            # Third call returns valid data
+            return httpx.Response(200, json=slots_response_payload([slot_payload(456)]))
+
+        client = set_handler(handler, authenticated=True)
 
         # Should succeed after retries
         date = datetime.now(AMSTERDAM_TZ)
@@ -294,41 +289,20 @@ class TestUSCRetryBehavior:
         assert len(result.data) == 1
         assert result.data[0].linkedProductId == 456
 
-    async def test_validation_error_contains_structured_slot_details(self, client):
+    async def test_validation_error_contains_structured_slot_details(self, set_handler):
         """Test that invalid slot errors include compact debugging details."""
         call_count = 0
 
-        async def mock_get(*args, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
             nonlocal call_count
             call_count += 1
-            response = MagicMock()
-            response.status_code = 200
-            response.raise_for_status.return_value = None
-            response.json.return_value = {
-                "data": [
-                    {
-                        "startDate": "2024-03-20T17:30:00.000Z",
-                        "endDate": "2024-03-20T19:00:00.000Z",
-                        "isAvailable": True,
-                        "linkedProductId": None,
-                        "bookableProductId": 123,
-                        "linkedProduct": {
-                            "id": 999,
-                            "description": "Unexpected payload shape from USC",
-                        },
-                    }
-                ],
-                "page": 1,
-                "count": 1,
-                "total": 1,
-                "pageCount": 1,
-            }
-            return response
-
-        client.client.get = AsyncMock(side_effect=mock_get)
-        client.auth = MagicMock()
-        client.auth.token_type = "Bearer"
-        client.auth.access_token = "token"
+            slot = slot_payload(
+                None,
+                linkedProduct={"id": 999, "description": "Unexpected payload shape from USC"},
+            )
+            return httpx.Response(200, json=slots_response_payload([slot]))
+
+        client = set_handler(handler, authenticated=True)
 
         date = datetime.now(AMSTERDAM_TZ)
 
@@ -347,38 +321,15 @@ class TestUSCRetryBehavior:
         assert "slot_index=0:" in message
         assert "slot_preview={'startDate': '2024-03-20T17:30:00.000Z'" in message
 
-    async def test_mixed_valid_and_invalid_slots_returns_valid_ones(self, client):
+    async def test_mixed_valid_and_invalid_slots_returns_valid_ones(self, set_handler):
         """Test that invalid slots are skipped when the response still contains valid slots."""
-        response = MagicMock()
-        response.status_code = 200
-        response.raise_for_status.return_value = None
-        response.json.return_value = {
-            "data": [
-                {
-                    "startDate": "2024-03-20T17:30:00.000Z",
-                    "endDate": "2024-03-20T18:14:00.000Z",
-                    "isAvailable": True,
-                    "linkedProductId": None,
-                    "bookableProductId": 123,
-                },
-                {
-                    "startDate": "2024-03-20T17:30:00.000Z",
-                    "endDate": "2024-03-20T18:14:00.000Z",
-                    "isAvailable": True,
-                    "linkedProductId": 456,
-                    "bookableProductId": 124,
-                },
-            ],
-            "page": 1,
-            "count": 2,
-            "total": 2,
-            "pageCount": 1,
-        }
-
-        client.client.get = AsyncMock(return_value=response)
-        client.auth = MagicMock()
-        client.auth.token_type = "Bearer"
-        client.auth.access_token = "token"
+        payload = slots_response_payload(
+            [
+                slot_payload(None, endDate="2024-03-20T18:14:00.000Z"),
+                slot_payload(456, endDate="2024-03-20T18:14:00.000Z", bookableProductId=124),
+            ]
+        )
+        client = set_handler(lambda request: httpx.Response(200, json=payload), authenticated=True)
 
         date = datetime.now(AMSTERDAM_TZ)
         result = await client.get_slots(date)
@@ -386,3 +337,46 @@ class TestUSCRetryBehavior:
         assert len(result.data) == 1
         assert result.data[0].linkedProductId == 456
         assert result.count == 2
+
+    async def test_unavailable_slots_are_skipped_without_validation(self, set_handler):
+        """Test that unavailable slots are left out before they are validated."""
+        call_count = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal call_count
+            call_count += 1
+            payload = slots_response_payload(
+                [
+                    # Invalid, but unavailable slots are never validated
+                    slot_payload(None, isAvailable=False),
+                    slot_payload(456, isAvailable=False, bookableProductId=124),
+                    slot_payload(456, bookableProductId=125),
+                ]
+            )
+            return httpx.Response(200, json=payload)
+
+        client = set_handler(handler, authenticated=True)
+
+        date = datetime.now(AMSTERDAM_TZ)
+        result = await client.get_slots(date)
+
+        assert call_count == 1, "Unavailable invalid slots should not cause a retry"
+        assert [slot.bookableProductId for slot in result.data] == [125]
+        assert result.count == 3
+
+    async def test_rejected_token_is_cleared_without_retry(self, set_handler):
+        """Test that a rejected access token isn't retried and makes the client log in again."""
+        call_count = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal call_count
+            call_count += 1
+            return httpx.Response(401, text="Unauthorized")
+
+        client = set_handler(handler, authenticated=True)
+
+        with pytest.raises(RuntimeError, match="Error getting member"):
+            await client.get_member()
+        assert call_count == 1, f"Should not retry a rejected token, but got {call_count} calls"
+        assert client.auth is None
+        assert client.needs_authentication
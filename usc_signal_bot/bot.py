@@ -1,26 +1,36 @@
+import asyncio
 import logging
 import os
+from functools import lru_cache
+from typing import Callable
 
 import yaml
-from signalbot import SignalBot
-
-from usc_signal_bot.commands import (
-    AliasesCommand,
-    BookTimeslotCommand,
-    GetTimeslotsCommand,
-    PingCommand,
-)
+
 from usc_signal_bot.config import Config
 
+try:
+    # libyaml-backed loader, bundled with the PyYAML wheels
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=4)
+def _load_config_uncached(config_file: str, mtime: float) -> Config:
+    """Parse and validate the config file.
+
+    The mtime is part of the cache key so an edited config file is reloaded.
+    """
+    logging.info("Loading config from %s", config_file)
+    with open(config_file) as f:
+        # Pydantic rejects anything that isn't a mapping with the expected fields
+        return Config.model_validate(yaml.load(f, Loader=_YamlLoader))
+
 
 def load_config() -> Config:
     """Load the config from the config file."""
-    config_file = os.getenv("CONFIG_FILE", "/config/config.yaml")
-    logging.info(f"Loading config from {config_file}")
-    with open(config_file) as f:
-        config = yaml.safe_load(f)
-    assert isinstance(config, dict)  # Type assertion for mypy
-    return Config(**config)
+    config_file = os.path.realpath(os.getenv("CONFIG_FILE", "/config/config.yaml"))
+    return _load_config_uncached(config_file, os.stat(config_file).st_mtime)
 
 
 def main():
@@ -28,26 +38,53 @@ def main():
     # Load main configuration
     config = load_config()
 
+    # signalbot and the commands (dateparser, httpx) are slow to import, so they
+    # are only imported after the config loaded successfully
+    from signalbot import Command, SignalBot
+
+    from usc_signal_bot.commands import (
+        AliasesCommand,
+        BookTimeslotCommand,
+        GetTimeslotsCommand,
+        PingCommand,
+    )
+    from usc_signal_bot.usc import create_http_client
+
     # Create and start the bot with config from file
-    logging.info(f"Starting bot with config: {config.bot}")
-    logging.info(f"Commands config: {config.commands}")
+    logging.info("Starting bot with config: %s", config.bot)
+    logging.info("Commands config: %s", config.commands)
     bot = SignalBot(config.bot.model_dump())
 
+    # All commands share one connection pool to USC for the lifetime of the bot
+    usc_http_client = create_http_client()
+
+    command_factories: dict[str, Callable[[Config], Command]] = {
+        "ping": lambda config: PingCommand(),
+        "timeslots": lambda config: GetTimeslotsCommand(config.usc, usc_http_client),
+        "book": lambda config: BookTimeslotCommand(config.usc, usc_http_client),
+        "aliases": lambda config: AliasesCommand(config.usc),
+    }
+
     # Register commands with their specific configurations
+    book_commands: list[BookTimeslotCommand] = []
     for cmd in config.commands:
-        logging.info(f"Registering command: {cmd.name}")
-        match cmd.name:
-            case "ping":
-                bot.register(PingCommand(), contacts=cmd.contacts, groups=cmd.groups)
-            case "timeslots":
-                bot.register(
-                    GetTimeslotsCommand(config.usc), contacts=cmd.contacts, groups=cmd.groups
-                )
-            case "book":
-                bot.register(
-                    BookTimeslotCommand(config.usc), contacts=cmd.contacts, groups=cmd.groups
-                )
-            case "aliases":
-                bot.register(AliasesCommand(config.usc), contacts=cmd.contacts, groups=cmd.groups)
-
-    bot.start()
+        factory = command_factories.get(cmd.name)
+        if factory is None:
+            logging.warning("Skipping unknown command: %s", cmd.name)
+            continue
+        logging.info("Registering command: %s", cmd.name)
+        command = factory(config)
+        if isinstance(command, BookTimeslotCommand):
+            book_commands.append(command)
+        bot.register(command, contacts=cmd.contacts, groups=cmd.groups)
+
+    async def close_usc_clients() -> None:
+        for book_command in book_commands:
+            await book_command.aclose()
+        await usc_http_client.aclose()
+
+    try:
+        bot.start()
+    finally:
+        # The bot runs the event loop until it is stopped, the loop is still open here
+        asyncio.get_event_loop().run_until_complete(close_usc_clients())
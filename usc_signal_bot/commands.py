@@ -2,72 +2,145 @@
 
 import asyncio
 import logging
-import math
 import os
 import re
-import shlex
-from argparse import ArgumentError, ArgumentParser, Namespace
-from datetime import datetime
-from functools import wraps
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 from typing import List, Optional
 
-from dateparser import parse
+import httpx
 from signalbot import Command, Context, triggered
 
 from usc_signal_bot._version import __version__
 from usc_signal_bot.config import BookingMember, USCCreds
-from usc_signal_bot.usc import AMSTERDAM_TZ, BookableSlot, USCClient, format_slot_date
+from usc_signal_bot.usc import AMSTERDAM_TZ, BookableSlot, USCClient, format_slot_date, parse_date
 
+MAX_PLAYERS_PER_COURT = 4
 
-def resolve_alias(email_or_alias: str, aliases: dict[str, str]) -> str:
+BOOK_COMMAND = "book"
+
+# Compiled once at import instead of going through re's pattern cache on every message.
+# Matched against the lowercased message text, so no case-insensitive matching is needed.
+TIMESLOTS_MESSAGE_PATTERN = re.compile(r"^timeslots(\s+\d{4}-\d{2}-\d{2})?$", re.ASCII)
+
+# Arguments like argparse treats as negative numbers instead of options
+NEGATIVE_NUMBER_PATTERN = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+# A command argument is either a double quoted, single quoted or whitespace separated token
+ARG_TOKEN_PATTERN = re.compile(r""""([^"]*)"|'([^']*)'|(\S+)""")
+
+
+def lowercase_aliases(aliases: dict[str, str]) -> dict[str, str]:
+    """Create a case-insensitive alias lookup for resolve_alias.
+
+    Args:
+        aliases: Dictionary mapping aliases to email addresses
+
+    Returns:
+        dict[str, str]: Dictionary mapping lowercase aliases to email addresses
+    """
+    return {k.lower(): v for k, v in aliases.items()}
+
+
+def resolve_alias(email_or_alias: str, aliases_lower: dict[str, str]) -> str:
     """Resolve an alias to an email address.
 
     Args:
         email_or_alias: Email address or alias to resolve (case insensitive)
-        aliases: Dictionary mapping aliases to email addresses
+        aliases_lower: Dictionary mapping lowercase aliases to email addresses,
+            as created by lowercase_aliases
 
     Returns:
         str: Resolved email address
     """
-    # Convert input to lowercase for case-insensitive matching
-    email_or_alias_lower = email_or_alias.lower()
+    return aliases_lower.get(email_or_alias.lower(), email_or_alias)
 
-    # Create case-insensitive alias lookup
-    aliases_lower = {k.lower(): v for k, v in aliases.items()}
 
-    return aliases_lower.get(email_or_alias_lower, email_or_alias)
+def split_args(text: str) -> List[str]:
+    """Split command text into arguments, keeping quoted arguments together.
+
+    Args:
+        text: Command text to split
+
+    Returns:
+        List[str]: Arguments with their surrounding quotes removed
+
+    Raises:
+        ValueError: If a quote is not closed, like shlex.split
+    """
+    # Most commands don't contain quotes, str.split handles those without the regex
+    if '"' not in text and "'" not in text:
+        return text.split()
+
+    args = []
+    for match in ARG_TOKEN_PATTERN.finditer(text):
+        double_quoted, single_quoted, unquoted = match.groups()
+        if unquoted is None:
+            args.append(single_quoted if double_quoted is None else double_quoted)
+        elif '"' in unquoted or "'" in unquoted:
+            # A quote in an unquoted argument has no closing quote, e.g. "john@usc.nl
+            raise ValueError("No closing quotation")
+        else:
+            args.append(unquoted)
+    return args
+
+
+async def _report_error(c: Context, func_name: str, e: Exception) -> None:
+    """Log the error that is being handled and report it in the chat."""
+    logging.exception("Error in %s", func_name)
+    await c.send(f"Error in {func_name}: {e}")
 
 
 def notify_error(func):
+    """Log errors raised by a command handler and report them in the chat.
+
+    Only Exception subclasses are handled, so cancellation (asyncio.CancelledError),
+    KeyboardInterrupt and SystemExit still propagate.
+    """
+
     @wraps(func)
     async def wrapper_notify_error(self, c: Context):
         try:
             return await func(self, c)
         except Exception as e:
-            logging.exception(f"Error in {func.__name__}")
-            await c.send(f"Error in {func.__name__}: {e}")
+            await _report_error(c, func.__name__, e)
 
     return wrapper_notify_error
 
 
-def ignore_unrelated_messages(start_word, case_sensitive=False):
-    def decorator_ignore_unrelated_messages(func):
+def signal_handler(start_word, case_sensitive=False):
+    """Handle only messages starting with start_word and report errors in the chat.
+
+    Combines ignoring unrelated messages with notify_error in a single wrapper, so every
+    incoming message goes through one extra frame instead of two.
+    """
+    start_word_length = len(start_word)
+    if not case_sensitive:
+        start_word = start_word.lower()
+
+    def decorator_signal_handler(func):
         @wraps(func)
-        async def wrapper_ignore_unrelated_messages(self, c: Context):
+        async def wrapper_signal_handler(self, c: Context):
             text = c.message.text
             if not isinstance(text, str):
                 return
 
+            # Only the prefix is compared, so don't lowercase the whole message
+            prefix = text[:start_word_length]
             if not case_sensitive:
-                text = text.lower()
-            if not text.startswith(start_word):
+                prefix = prefix.lower()
+            if prefix != start_word:
                 return
 
-            return await func(self, c)
+            try:
+                return await func(self, c)
+            except Exception as e:
+                await _report_error(c, func.__name__, e)
 
-        return wrapper_ignore_unrelated_messages
+        return wrapper_signal_handler
 
-    return decorator_ignore_unrelated_messages
+    return decorator_signal_handler
 
 
 def get_version() -> str:
@@ -80,93 +153,141 @@ def get_hostname() -> str:
     return os.getenv("HOSTNAME", "unknown")
 
 
+# Neither changes while the bot runs, so they are looked up once instead of on every ping
+HOSTNAME = get_hostname()
+VERSION = get_version()
+
+
+@lru_cache(maxsize=128)
+def _allocate_courts(
+    booking_member_emails: tuple[str, ...], players: tuple[str, ...], courts: int
+) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Allocate booking members to groups of players by email.
+
+    The allocation only depends on its arguments, so repeated requests for the same
+    players are served from the cache. Results are tuples so cached values can't be mutated.
+
+    Args:
+        booking_member_emails: Emails of all booking members, in config order
+        players: Player emails to book for
+        courts: Number of courts user wants us to book
+
+    Returns:
+        Tuple of (booking_member_email, members_to_book_for) pairs
+    """
+    amount_of_players = len(players)
+    # Email addresses are case insensitive, so players match booking members regardless of case
+    players_lower = {p.lower() for p in players}
+    authenticated_players = [
+        email for email in booking_member_emails if email.lower() in players_lower
+    ]
+    # Ceiling division: 1 slot per maximum MAX_PLAYERS_PER_COURT players
+    amount_of_bookings_required = -(-amount_of_players // MAX_PLAYERS_PER_COURT)
+
+    # Check if the user is a pannenkoek and wants too little courts
+    if courts < amount_of_bookings_required:
+        raise RuntimeError(
+            f"Requested {courts} courts, but at least {amount_of_bookings_required} are needed for {amount_of_players} players"
+        )
+
+    amount_of_bookings_to_make = max(amount_of_bookings_required, courts)
+    if len(authenticated_players) < amount_of_bookings_to_make:
+        raise RuntimeError(
+            f"Not enough authenticated booking members available to book {amount_of_bookings_to_make} squash courts"
+        )
+
+    booking_members = authenticated_players[:amount_of_bookings_to_make]
+    booking_members_lower = {email.lower() for email in booking_members}
+    guests = tuple(p for p in players if p.lower() not in booking_members_lower)
+
+    # Each booking member is part of their own booking, so they fill up the
+    # remaining spots of the court with guests in the order they were requested
+    guests_per_court = -(-amount_of_players // courts) - 1
+    return tuple(
+        (booking_member, guests[i * guests_per_court : (i + 1) * guests_per_court])
+        for i, booking_member in enumerate(booking_members)
+    )
+
+
 class AliasesCommand(Command):
     """Command to display all configured aliases."""
 
     def __init__(self, usc_creds: USCCreds):
         super().__init__()
         self.usc_creds = usc_creds
+        # The aliases don't change while the bot runs, so the response is formatted once
+        self._response = self._format_aliases(usc_creds.aliases)
 
-    def setup(self):
-        logging.info("Setting up AliasesCommand")
-        return super().setup()
+    @staticmethod
+    def _format_aliases(aliases: dict[str, str]) -> Optional[str]:
+        """Format the aliases as a chat message.
 
-    def describe(self) -> str:
-        logging.info("Describing AliasesCommand")
-        return super().describe()
+        Args:
+            aliases: Dictionary mapping aliases to email addresses
 
-    @ignore_unrelated_messages("aliases")
-    @notify_error
+        Returns:
+            Optional[str]: Formatted aliases or None if no aliases are configured
+        """
+        if not aliases:
+            return None
+
+        # Format the aliases nicely
+        alias_lines = [f"- **{alias}** → {email}" for alias, email in sorted(aliases.items())]
+        return "Configured aliases:\n" + "\n".join(alias_lines)
+
+    @signal_handler("aliases")
     async def handle(self, c: Context):
         """Handle the aliases command."""
         logging.info("Handling aliases command")
 
-        if not self.usc_creds.aliases:
+        if self._response is None:
             await c.send("No aliases configured.")
             return
 
-        # Format the aliases nicely
-        alias_lines = [
-            f"- **{alias}** → {email}" for alias, email in sorted(self.usc_creds.aliases.items())
-        ]
-
-        response = "Configured aliases:\n" + "\n".join(alias_lines)
-        await c.send(response, text_mode="styled")
+        await c.send(self._response, text_mode="styled")
 
 
 class PingCommand(Command):
     """Simple ping command that responds with the current time."""
 
-    def setup(self):
-        logging.info("Setting up PingCommand")
-        return super().setup()
-
-    def describe(self) -> str:
-        logging.info("Describing PingCommand")
-        return super().describe()
-
     @notify_error
     @triggered("ping")
     async def handle(self, c: Context):
-        logging.info(f"Received message: {c.message.text}")
-        hostname = get_hostname()
-        version = get_version()
-        await c.send(f"Pong {datetime.now(AMSTERDAM_TZ)} - {hostname} - v{version}")
+        logging.info("Received message: %s", c.message.text)
+        await c.send(f"Pong {datetime.now(AMSTERDAM_TZ)} - {HOSTNAME} - v{VERSION}")
 
 
 class GetTimeslotsCommand(Command):
     """Command to get available timeslots from USC."""
 
-    def __init__(self, usc_creds: USCCreds):
+    def __init__(self, usc_creds: USCCreds, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize the command.
+
+        Args:
+            usc_creds: USC credentials
+            http_client: Optional HTTP client shared by all commands, so its connections to
+                USC are reused. Without it, every message sets up its own connections.
+        """
         super().__init__()
         self.usc_creds = usc_creds
-        self.message_pattern = re.compile(r"^timeslots(\s+\d{4}-\d{2}-\d{2})?$", re.IGNORECASE)
+        self.http_client = http_client
 
-    def setup(self):
-        logging.info("Setting up GetTimeslotsCommand")
-        return super().setup()
-
-    def describe(self) -> str:
-        logging.info("Describing GetTimeslotsCommand")
-        return super().describe()
-
-    @ignore_unrelated_messages("timeslots")
-    @notify_error
+    @signal_handler("timeslots")
     async def handle(self, c: Context):
-        match = self.message_pattern.match(c.message.text)
+        match = TIMESLOTS_MESSAGE_PATTERN.match(c.message.text.lower())
         if not match:
             await c.send(
                 "Invalid message format. Please use the following format:\ntimeslots <date?>"
             )
             return
-        logging.info(f"Received message: {c.message.text}")
+        logging.info("Received message: %s", c.message.text)
 
         date_str = match.group(1)
         if date_str:
-            date = parse(date_str.strip())
+            date = parse_date(date_str.strip())
         else:
             # By default timeslots are released 6 days in advance
-            date = parse("6 days later")
+            date = datetime.now(AMSTERDAM_TZ) + timedelta(days=6)
         if not date:
             await c.send("Invalid date format. Please use the following format:\ntimeslots <date?>")
             return
@@ -177,9 +298,12 @@ class GetTimeslotsCommand(Command):
 
         # Use the first booking member's credentials
         booking_member = self.usc_creds.bookingMembers[0]
-        usc = USCClient()
-        await usc.authenticate(booking_member.username, booking_member.password)
-        timeslots = await usc.get_slots(date)
+        usc = USCClient(http_client=self.http_client)
+        try:
+            await usc.authenticate(booking_member.username, booking_member.password)
+            timeslots = await usc.get_slots(date)
+        finally:
+            await usc.close()
 
         # Format the response
         grouped_slots = usc.format_slots(timeslots.data)
@@ -195,25 +319,56 @@ class GetTimeslotsCommand(Command):
             response = f"No available slots found for **{day_str}**"
 
         await c.send(response, text_mode="styled")
-        await usc.close()
 
 
 class BookTimeslotCommand(Command):
     """Command to book a timeslot from USC."""
 
-    def __init__(self, usc_creds: USCCreds):
+    def __init__(self, usc_creds: USCCreds, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize the command.
+
+        Args:
+            usc_creds: USC credentials
+            http_client: Optional HTTP client shared by all commands, so its connections to
+                USC are reused. Without it, each booking member's client has its own connections.
+        """
         super().__init__()
         self.usc_creds = usc_creds
-        self.parser = self._create_parser()
+        self.http_client = http_client
+        # USC clients by booking member email. They stay authenticated between messages,
+        # so booking members only log in again when their access token expires.
+        self._clients: dict[str, USCClient] = {}
+        # Lookup of booking members by email, in config order
+        self._creds_by_email: dict[str, BookingMember] = {
+            bm.username: bm for bm in usc_creds.bookingMembers
+        }
+        # Booking member emails in config order, which decides who books first
+        self._creds_emails = tuple(self._creds_by_email)
+        self._aliases_lower = lowercase_aliases(usc_creds.aliases)
+        # USC member ids by booking member email. A member id never changes for an
+        # account, so it only has to be fetched on the first booking.
+        self._member_ids: dict[str, int] = {}
 
     async def log(self, context: Context, message: str):
         logging.info(message)
         try:
             await context.send(message, text_mode="styled")
         except Exception as e:
-            logging.exception(f"Error sending message: {e}")
+            logging.exception("Error sending message: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the USC clients of the booking members.
+
+        Clients created without an HTTP client own their connection pool, which is closed
+        here. The shared HTTP client is left open for its owner to close.
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for usc in clients:
+            await usc.close()
 
-    def _create_parser(self) -> ArgumentParser:
+    @staticmethod
+    def _create_parser() -> ArgumentParser:
         """Create the argument parser for the book command."""
         parser = ArgumentParser(
             prog="book",
@@ -245,13 +400,49 @@ class BookTimeslotCommand(Command):
         )
         return parser
 
-    def setup(self):
-        logging.info("Setting up BookTimeslotCommand")
-        return super().setup()
+    # The parser is stateless, so it is built once and shared by all instances.
+    # It only provides the help text, _parse_args parses the arguments itself.
+    _PARSER = _create_parser()
+    _HELP = _PARSER.format_help()
+    _POSITIONAL_ARGS = ("courts", "date", "time", "members")
+
+    async def _get_client(self, booking_member: BookingMember) -> USCClient:
+        """Get the USC client of a booking member, authenticating it when needed.
+
+        Args:
+            booking_member: Booking member to get the client for
+
+        Returns:
+            USCClient: USC client authenticated as the booking member
+        """
+        usc = self._clients.get(booking_member.username)
+        if usc is None:
+            usc = self._clients[booking_member.username] = USCClient(http_client=self.http_client)
+
+        if usc.needs_authentication:
+            try:
+                await usc.authenticate(booking_member.username, booking_member.password)
+            except Exception:
+                # The account may have changed, so fetch its member id again next time
+                self._member_ids.pop(booking_member.username, None)
+                raise
+        return usc
+
+    async def _get_member_id(self, usc: USCClient, booking_member: BookingMember) -> int:
+        """Get the USC member id of a booking member, fetching it only once.
 
-    def describe(self) -> str:
-        logging.info("Describing BookTimeslotCommand")
-        return super().describe()
+        Args:
+            usc: USC client authenticated as the booking member
+            booking_member: Booking member to get the member id for
+
+        Returns:
+            int: USC member id
+        """
+        member_id = self._member_ids.get(booking_member.username)
+        if member_id is None:
+            member_id = (await usc.get_member()).id
+            self._member_ids[booking_member.username] = member_id
+        return member_id
 
     async def _make_booking(
         self,
@@ -260,6 +451,7 @@ class BookTimeslotCommand(Command):
         booking_member: BookingMember,
         dry_run: bool = False,
         pre_assigned_slot: Optional[BookableSlot] = None,
+        prefetched_member_id: Optional[int | BaseException] = None,
     ) -> str:
         """Make a booking with a specific member's credentials.
 
@@ -269,16 +461,22 @@ class BookTimeslotCommand(Command):
             booking_member: Credentials to use for booking
             dry_run: If True, only simulate the booking without actually making it
             pre_assigned_slot: Optional pre-assigned slot to book
+            prefetched_member_id: Optional member id of the booking member that was already
+                fetched, or the error fetching it, so it isn't fetched again
 
         Returns:
             str: Booking response message
         """
-        usc = USCClient()
         try:
-            await usc.authenticate(booking_member.username, booking_member.password)
+            usc = await self._get_client(booking_member)
 
-            # Get member info first as we need it for both cases
-            booking_member_info = await usc.get_member()
+            # Get member id first as we need it for both cases
+            if isinstance(prefetched_member_id, BaseException):
+                raise prefetched_member_id
+            if prefetched_member_id is None:
+                member_id = await self._get_member_id(usc, booking_member)
+            else:
+                member_id = prefetched_member_id
 
             if pre_assigned_slot:
                 slot = pre_assigned_slot
@@ -287,7 +485,7 @@ class BookTimeslotCommand(Command):
                 if not slot:
                     raise RuntimeError(f"No available slot found on {date}")
 
-            booking_data = usc.create_booking_data(booking_member_info.id, members, slot=slot)
+            booking_data = usc.create_booking_data(member_id, members, slot=slot)
 
             if dry_run:
                 return f"[DRY RUN] Would book slot {format_slot_date(slot.startDate)} - {format_slot_date(slot.endDate)} with {booking_member.username} for members {', '.join(members)}"
@@ -296,8 +494,6 @@ class BookTimeslotCommand(Command):
             return f"Booking successful with {booking_member.username} for members {', '.join(members)}"
         except Exception as e:
             return f"{'[DRY RUN] ' if dry_run else ''}Booking failed with {booking_member.username}: {str(e)}"
-        finally:
-            await usc.close()
 
     def _allocate_bookings(
         self, players: List[str], courts: int
@@ -315,86 +511,82 @@ class BookTimeslotCommand(Command):
         Returns:
             List of tuples containing (booking_member, list_of_members_to_book_for)
         """
-        amount_of_players = len(players)
-        authenticated_players = [m for m in self.usc_creds.bookingMembers if m.username in players]
-        allocations: List[tuple[BookingMember, List[str]]] = []
-        remaining_players = players.copy()
-        amount_of_bookings_required = math.ceil(
-            amount_of_players / 4
-        )  # 1 slot per maximum 4 players
-
-        # Check if the user is a pannenkoek and wants too little courts
-        if courts < amount_of_bookings_required:
-            raise RuntimeError(
-                f"Requested {courts} courts, but at least {amount_of_bookings_required} are needed for {amount_of_players} players"
-            )
-
-        amount_of_bookings_to_make = max(amount_of_bookings_required, courts)
-        amount_of_authenticated_players = len(authenticated_players)
-        players_to_book = [m.username for m in authenticated_players][:amount_of_bookings_to_make]
-
-        if amount_of_authenticated_players < amount_of_bookings_to_make:
-            raise RuntimeError(
-                f"Not enough authenticated booking members available to book {amount_of_bookings_to_make} squash courts"
-            )
+        allocations = _allocate_courts(self._creds_emails, tuple(players), courts)
+        return [
+            (self._creds_by_email[email], list(members_to_book))
+            for email, members_to_book in allocations
+        ]
 
-        players_per_court = math.ceil(amount_of_players / courts)  # Calculate players per court
-        for i in range(amount_of_bookings_to_make):
-            booking_member = authenticated_players[i]
-            current_group = []
-            remaining_players.remove(booking_member.username)
-            j = 0
-            # For the players_per_court we remove the booking member from the amount of players to book
-            while len(remaining_players) > 0 and len(current_group) < players_per_court - 1:
-                next_player = remaining_players[j]
-                if next_player not in players_to_book:
-                    current_group.append(next_player)
-                    remaining_players.remove(next_player)
-                else:
-                    j += 1
-            allocations.append((booking_member, current_group))
-
-        return allocations
+    def _parse_error(self, message: str) -> RuntimeError:
+        """Create the error for invalid arguments, including the usage of the command."""
+        return RuntimeError(f"Error parsing arguments: {message}\n{self._HELP}")
 
     def _parse_args(self, text: str) -> Optional[Namespace]:
         """Parse command arguments from text.
 
+        Accepts the same arguments as _PARSER, without going through argparse and its
+        SystemExit on every invalid message.
+
         Args:
-            text: Command text to parse
+            text: Command text to parse, starting with the command name
 
         Returns:
             Optional[Namespace]: Parsed arguments or None if help requested
         """
-        # Remove the command name and split into args
-        args_str = re.sub(r"^book\s+", "", text.strip(), flags=re.IGNORECASE)
+        # The handler only receives messages starting with the command name,
+        # so it can be sliced off instead of matched again
         try:
-            args = shlex.split(args_str)
-            if "--help" in args or "-h" in args:
-                return None
-            return self.parser.parse_args(args)
-        except (ArgumentError, ValueError, SystemExit) as e:
-            raise RuntimeError(
-                f"Error parsing arguments: {str(e)}\n{self.parser.format_help()}"
-            ) from e
-
-    @ignore_unrelated_messages("book")
-    @notify_error
+            args = split_args(text[len(BOOK_COMMAND) :])
+        except ValueError as e:
+            raise self._parse_error(str(e)) from None
+        if "--help" in args or "-h" in args:
+            return None
+
+        dry_run = False
+        positional_args: List[str] = []
+        remaining_args = iter(args)
+        for arg in remaining_args:
+            if arg == "--":
+                # Like argparse, everything after "--" is a positional argument
+                positional_args.extend(remaining_args)
+                break
+            if len(arg) > 2 and "--dry-run".startswith(arg):
+                # argparse also accepts abbreviations of long options, like --dry
+                dry_run = True
+            elif arg.startswith("-") and not NEGATIVE_NUMBER_PATTERN.match(arg):
+                raise self._parse_error(f"unrecognized arguments: {arg}")
+            else:
+                positional_args.append(arg)
+
+        if len(positional_args) < len(self._POSITIONAL_ARGS):
+            missing = ", ".join(self._POSITIONAL_ARGS[len(positional_args) :])
+            raise self._parse_error(f"the following arguments are required: {missing}")
+
+        courts_arg, date, time, *members = positional_args
+        try:
+            courts = int(courts_arg)
+        except ValueError:
+            raise self._parse_error(f"argument courts: invalid int value: '{courts_arg}'") from None
+
+        return Namespace(dry_run=dry_run, courts=courts, date=date, time=time, members=members)
+
+    @signal_handler(BOOK_COMMAND)
     async def handle(self, c: Context):
-        logging.info(f"Received message: {c.message.text}")
+        logging.info("Received message: %s", c.message.text)
 
         try:
             args = self._parse_args(c.message.text)
             if args is None:
                 # Help requested
-                await self.log(c, self.parser.format_help())
+                await self.log(c, self._HELP)
                 return
 
-            date = parse(f"{args.date} {args.time}", settings={"TIMEZONE": "Europe/Amsterdam"})
+            date = parse_date(f"{args.date} {args.time}", settings={"TIMEZONE": "Europe/Amsterdam"})
             if not date:
                 raise RuntimeError(f"Failed to parse date '{args.date} {args.time}'")
 
             # Resolve aliases to email addresses
-            resolved_members = [resolve_alias(m, self.usc_creds.aliases) for m in args.members]
+            resolved_members = [resolve_alias(m, self._aliases_lower) for m in args.members]
 
             # Validate the number of courts for the amount of members
             if args.courts > len(resolved_members):
@@ -403,39 +595,38 @@ class BookTimeslotCommand(Command):
             # Allocate bookings smartly
             allocations = self._allocate_bookings(resolved_members, args.courts)
 
-            # First get all slots and assign them to each booking
-            usc = USCClient()
-            try:
-                # Use first member's credentials to get slots
-                first_member = allocations[0][0]
-                await usc.authenticate(first_member.username, first_member.password)
-
-                # Get the required number of slots
-                available_slots = await usc.get_slots_for_booking(date, len(allocations))
-
-                # Assign slots to each booking
-                booking_allocations: List[tuple[BookingMember, List[str], BookableSlot]] = []
-                for i, (booking_member, members_to_book) in enumerate(allocations):
-                    booking_allocations.append(
-                        (booking_member, members_to_book, available_slots[i])
-                    )
-            finally:
-                await usc.close()
+            # First get all slots and assign them to each booking,
+            # using the first member's credentials to get slots
+            first_booking_member = allocations[0][0]
+            usc = await self._get_client(first_booking_member)
+
+            # Get the required number of slots. The first member's id only needs the
+            # authenticated client as well, so it is fetched in the same round trip.
+            # An error fetching it only fails the first member's booking.
+            available_slots, first_member_id = await asyncio.gather(
+                usc.get_slots_for_booking(date, len(allocations)),
+                self._get_member_id(usc, first_booking_member),
+                return_exceptions=True,
+            )
+            if isinstance(available_slots, BaseException):
+                raise available_slots
 
             # Make bookings in parallel with pre-assigned slots
             booking_tasks = [
-                self._make_booking(date, members_to_book, booking_member, args.dry_run, slot)
-                for booking_member, members_to_book, slot in booking_allocations
+                self._make_booking(
+                    date,
+                    members_to_book,
+                    booking_member,
+                    args.dry_run,
+                    available_slots[i],
+                    first_member_id if i == 0 else None,
+                )
+                for i, (booking_member, members_to_book) in enumerate(allocations)
             ]
 
-            # Wait for all bookings to complete
-            booking_results = await asyncio.gather(*booking_tasks)
-
-            # Send combined response
-            prefix = "[DRY RUN] " if args.dry_run else ""
-            response = f"{prefix}Booking Results:\n" + "\n".join(
-                f"- {result}" for result in booking_results
-            )
-            await self.log(c, response)
-        except (RuntimeError, ArgumentError) as e:
+            # Report each booking as soon as it completes, so a slow booking
+            # doesn't hold back the results of the others
+            for booking in asyncio.as_completed(booking_tasks):
+                await self.log(c, await booking)
+        except RuntimeError as e:
             await self.log(c, str(e))
@@ -2,7 +2,7 @@
 
 from typing import Dict, List, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class SignalConfig(BaseModel):
@@ -23,6 +23,8 @@ class CommandConfig(BaseModel):
 class BookingMember(BaseModel):
     """Credentials for a single USC member."""
 
+    model_config = ConfigDict(frozen=True)
+
     username: str
     password: str
 
@@ -30,6 +32,8 @@ class BookingMember(BaseModel):
 class USCCreds(BaseModel):
     """Credentials for the USC API."""
 
+    model_config = ConfigDict(frozen=True)
+
     bookingMembers: List[BookingMember]
     aliases: Dict[str, str] = {}
 
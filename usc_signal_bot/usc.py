@@ -2,14 +2,15 @@
 
 import json
 import logging
+import time
+from collections import defaultdict
 from datetime import datetime
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, TypeVar
 from zoneinfo import ZoneInfo
 
 import httpx
-from dateparser import parse
-from pydantic import BaseModel, ValidationError, field_serializer
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_serializer
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 T = TypeVar("T")
@@ -18,6 +19,11 @@ T = TypeVar("T")
 # All dates in the USC API are in UTC.
 AMSTERDAM_TZ = ZoneInfo("Europe/Amsterdam")
 UTC_TZ = ZoneInfo("UTC")
+DATEPARSER_LANGUAGES = ("en",)
+# USC rejected the credentials or access token, retrying the same request won't help
+AUTH_ERROR_STATUS_CODES = frozenset({401, 403})
+# Formats of dates entered in chat commands, parsed without going through dateparser
+CHAT_DATE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d")
 
 
 def _format_validation_location(location: tuple[Any, ...]) -> str:
@@ -65,10 +71,10 @@ def _is_retryable_error(exception: Exception) -> bool:
     if isinstance(exception, (httpx.NetworkError, httpx.TimeoutException)):
         return True
 
-    # Retry on any HTTP status code >= 400
+    # Retry on any HTTP status code >= 400, except for rejected authentication
     if isinstance(exception, httpx.HTTPStatusError):
         status_code = exception.response.status_code
-        return status_code >= 400
+        return status_code >= 400 and status_code not in AUTH_ERROR_STATUS_CODES
 
     # Retry on Pydantic ValidationError (invalid API response data)
     if isinstance(exception, ValidationError):
@@ -78,7 +84,7 @@ def _is_retryable_error(exception: Exception) -> bool:
     if isinstance(exception, RuntimeError) and exception.__cause__ is not None:
         if isinstance(exception.__cause__, httpx.HTTPStatusError):
             status_code = exception.__cause__.response.status_code
-            return status_code >= 400
+            return status_code >= 400 and status_code not in AUTH_ERROR_STATUS_CODES
         if isinstance(exception.__cause__, ValidationError):
             return True
 
@@ -88,7 +94,7 @@ def _is_retryable_error(exception: Exception) -> bool:
 def retry_api_call(func: Callable[..., T]) -> Callable[..., T]:
     """Decorator to retry API calls with exponential backoff.
 
-    Retries on network errors, timeouts, and HTTP status codes >= 400.
+    Retries on network errors, timeouts, and HTTP status codes >= 400, except 401 and 403.
     Uses exponential backoff: 1s, 2s, 4s, 8s.
     Maximum 4 retry attempts.
 
@@ -104,11 +110,14 @@ def retry_api_call(func: Callable[..., T]) -> Callable[..., T]:
         exception = retry_state.outcome.exception() if retry_state.outcome.failed else None
         if exception:
             logging.warning(
-                f"Retrying {func.__name__} (attempt {retry_state.attempt_number}) "
-                f"after {type(exception).__name__}: {exception}"
+                "Retrying %s (attempt %s) after %s: %s",
+                func.__name__,
+                retry_state.attempt_number,
+                type(exception).__name__,
+                exception,
             )
         else:
-            logging.warning(f"Retrying {func.__name__} (attempt {retry_state.attempt_number})")
+            logging.warning("Retrying %s (attempt %s)", func.__name__, retry_state.attempt_number)
 
     retry_decorator = retry(
         stop=stop_after_attempt(4),
@@ -171,9 +180,10 @@ class BookingParams(BaseModel):
     clickedOnBook: bool
     startDate: datetime
     endDate: datetime
-    invitedGuests: List[str]
+    # The bot only invites members, guests and others are always sent as empty lists
+    invitedGuests: List[str] = Field(default_factory=list)
     invitedMemberEmails: List[str]
-    invitedOthers: List[str]
+    invitedOthers: List[str] = Field(default_factory=list)
     secondaryPurchaseMessage: Optional[str] = None
     primaryPurchaseMessage: Optional[str] = None
 
@@ -193,19 +203,109 @@ class BookingData(BaseModel):
     dateOfRegistration: Optional[str] = None
 
 
+USC_BASE_URL = "https://backbone-web-api.production.uva.delcom.nl"
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Create an HTTP client for the USC API.
+
+    The client keeps a pool of connections to the USC API, so it can be shared between
+    USCClients to avoid setting up new connections for every command.
+
+    Args:
+        transport: Optional httpx transport, e.g. an httpx.MockTransport in tests
+
+    Returns:
+        httpx.AsyncClient: HTTP client for the USC API
+    """
+    timeout = httpx.Timeout(10.0, connect=10.0, read=30.0)
+    # Commands often follow each other within a minute (timeslots, then book). The default
+    # 5s keep-alive would close the connections before the next command could reuse them.
+    limits = httpx.Limits(max_keepalive_connections=5, max_connections=10, keepalive_expiry=60.0)
+    return httpx.AsyncClient(
+        base_url=USC_BASE_URL,
+        timeout=timeout,
+        limits=limits,
+        transport=transport,
+    )
+
+
+# Serializes booking data to JSON bytes, where model_dump_json returns a str to be encoded again
+BOOKING_DATA_ADAPTER = TypeAdapter(BookingData)
+
+
 class USCClient:
     """USC API client."""
 
-    BASE_URL = "https://backbone-web-api.production.uva.delcom.nl"
+    BASE_URL = USC_BASE_URL
     FROM_TIME = "10:00:00.000"
     UNTIL_TIME = "19:00:00.000"
+    # Parsed once, format_slots compares the time of every slot against them
+    FROM_TIME_OF_DAY = datetime.strptime(FROM_TIME, "%H:%M:%S.%f").time()
+    UNTIL_TIME_OF_DAY = datetime.strptime(UNTIL_TIME, "%H:%M:%S.%f").time()
+    # Relations to include in bookable slots, the same for every request
+    SLOTS_JOIN_PARAM = json.dumps(["linkedProduct", "product"])
+    # Filter for bookable slots in which only the date changes, serialized once with a
+    # %(date)s placeholder. Dates can't contain characters that need escaping in JSON.
+    SLOTS_FILTER_TEMPLATE = json.dumps(
+        {
+            "startDate": f"%(date)sT{FROM_TIME}Z",
+            "endDate": f"%(date)sT{UNTIL_TIME}Z",
+            "tagIds": {"$in": [195]},
+        }
+    )
+    # Seconds before the access token expires at which the client authenticates again,
+    # so the token doesn't expire halfway through a request
+    AUTH_EXPIRY_MARGIN = 60.0
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """Initialize the USC client.
+
+        Args:
+            transport: Optional httpx transport, e.g. an httpx.MockTransport in tests
+            http_client: Optional HTTP client to share its connection pool with another
+                USCClient. The client is not closed by this USCClient.
+        """
+        self._owns_client = http_client is None
+        self.client = http_client or create_http_client(transport)
+        self.auth = None
+        self._auth_expires_at = 0.0
+
+    @property
+    def auth(self) -> Optional[Auth]:
+        """Authentication of the client, None if it isn't authenticated."""
+        return self._auth
+
+    @auth.setter
+    def auth(self, auth: Optional[Auth]) -> None:
+        self._auth = auth
+        # Built once per authentication instead of for every request
+        self._auth_headers = (
+            {
+                "Authorization": f"{auth.token_type} {auth.access_token}",
+                "Content-Type": "application/json",
+            }
+            if auth
+            else {}
+        )
+
+    @property
+    def needs_authentication(self) -> bool:
+        """Whether the client is not authenticated or its access token (almost) expired."""
+        return self.auth is None or time.monotonic() >= self._auth_expires_at
+
+    def _clear_rejected_auth(self, error: httpx.HTTPStatusError) -> None:
+        """Forget the access token when USC rejected it, so the client authenticates again.
 
-    def __init__(self) -> None:
-        """Initialize the USC client."""
-        timeout = httpx.Timeout(10.0, connect=10.0, read=30.0)
-        limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        self.client = httpx.AsyncClient(base_url=self.BASE_URL, timeout=timeout, limits=limits)
-        self.auth: Optional[Auth] = None
+        Args:
+            error: HTTP error of a request made with the access token
+        """
+        if error.response.status_code in AUTH_ERROR_STATUS_CODES:
+            self.auth = None
 
     @retry_api_call
     async def authenticate(self, username: str, password: str) -> Auth:
@@ -226,13 +326,19 @@ class USCClient:
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            logging.error(f"Error authenticating with USC: {e}")
-            logging.error(f"Response: {response.text}")
+            logging.error("Error authenticating with USC: %s", e)
+            logging.error("Response: %s", response.text)
             raise RuntimeError(
                 f"Error authenticating with USC: {e}; response: {response.text}"
             ) from e
         self.auth = Auth(**response.json())
-        logging.info(f"Authenticated with USC: {self.auth}")
+        try:
+            expires_in = float(self.auth.expires_in)
+        except ValueError:
+            # Unknown lifetime, authenticate again next time the client is used
+            expires_in = 0.0
+        self._auth_expires_at = time.monotonic() + expires_in - self.AUTH_EXPIRY_MARGIN
+        logging.info("Authenticated with USC: %s", self.auth)
         return self.auth
 
     @retry_api_call
@@ -243,7 +349,7 @@ class USCClient:
             date: Date to get slots for (in Amsterdam timezone)
 
         Returns:
-            BookableSlotsResponse: Available slots
+            BookableSlotsResponse: Available slots, slots that are not available are left out
         """
         if not self.auth:
             raise RuntimeError("Not authenticated")
@@ -255,37 +361,28 @@ class USCClient:
         date_str = utc_date.strftime("%Y-%m-%d")
 
         logging.info(
-            f"Getting slots from {date_str}T{self.FROM_TIME}Z to {date_str}T{self.UNTIL_TIME}Z"
+            "Getting slots from %sT%sZ to %sT%sZ",
+            date_str,
+            self.FROM_TIME,
+            date_str,
+            self.UNTIL_TIME,
         )
         params = {
-            "s": json.dumps(
-                {
-                    "startDate": f"{date_str}T{self.FROM_TIME}Z",
-                    "endDate": f"{date_str}T{self.UNTIL_TIME}Z",
-                    "tagIds": {"$in": [195]},
-                }
-            ),
-            "join": json.dumps(
-                [
-                    "linkedProduct",
-                    "product",
-                ]
-            ),
+            "s": self.SLOTS_FILTER_TEMPLATE % {"date": date_str},
+            "join": self.SLOTS_JOIN_PARAM,
         }
 
         response = await self.client.get(
             "/bookable-slots",
             params=params,
-            headers={
-                "Authorization": f"{self.auth.token_type} {self.auth.access_token}",
-                "Content-Type": "application/json",
-            },
+            headers=self._auth_headers,
         )
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            logging.error(f"Error getting slots: {e}")
-            logging.error(f"Response: {response.text}")
+            self._clear_rejected_auth(e)
+            logging.error("Error getting slots: %s", e)
+            logging.error("Response: %s", response.text)
             raise RuntimeError(f"Error getting slots: {e}; response: {response.text}") from e
         data = response.json()
 
@@ -294,9 +391,14 @@ class USCClient:
         invalid_slot_errors: list[str] = []
         first_validation_error: ValidationError | None = None
 
+        # Slots are validated instead of trusted, USC sometimes returns slots that can't be
+        # booked (e.g. without a linkedProductId). model_validate avoids unpacking each slot.
         for index, slot in enumerate(raw_slots):
+            # Unavailable slots can't be booked either, so they aren't worth validating
+            if isinstance(slot, dict) and slot.get("isAvailable") is False:
+                continue
             try:
-                slots.append(BookableSlot(**slot))
+                slots.append(BookableSlot.model_validate(slot))
             except ValidationError as e:
                 if first_validation_error is None:
                     first_validation_error = e
@@ -373,16 +475,14 @@ class USCClient:
         response = await self.client.get(
             "/auth",
             params={"cf": 0},
-            headers={
-                "Authorization": f"{self.auth.token_type} {self.auth.access_token}",
-                "Content-Type": "application/json",
-            },
+            headers=self._auth_headers,
         )
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            logging.error(f"Error getting member: {e}")
-            logging.error(f"Response: {response.text}")
+            self._clear_rejected_auth(e)
+            logging.error("Error getting member: %s", e)
+            logging.error("Response: %s", response.text)
             raise RuntimeError(f"Error getting member: {e}; response: {response.text}") from e
         return Member(**response.json())
 
@@ -410,9 +510,7 @@ class USCClient:
                 clickedOnBook=True,
                 startDate=slot.startDate,
                 endDate=slot.endDate,
-                invitedGuests=[],
                 invitedMemberEmails=members,
-                invitedOthers=[],
             ),
         )
 
@@ -429,28 +527,28 @@ class USCClient:
         if not self.auth:
             raise RuntimeError("Not authenticated")
 
+        # Serialized to bytes by pydantic directly, httpx sends them as is
+        content = BOOKING_DATA_ADAPTER.dump_json(booking_data)
         response = await self.client.post(
             "/participations",
-            # json=booking_data.model_dump_json(),
-            data=booking_data.model_dump_json(),  # type: ignore
-            headers={
-                "Authorization": f"{self.auth.token_type} {self.auth.access_token}",
-                "Content-Type": "application/json",
-            },
+            content=content,
+            headers=self._auth_headers,
         )
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            logging.error(f"Error booking slot: {e}")
-            logging.error(f"Response: {response.text}")
+            self._clear_rejected_auth(e)
+            logging.error("Error booking slot: %s", e)
+            logging.error("Response: %s", response.text)
             raise RuntimeError(
-                f"Error booking slot: {e}; response: {response.text}; booking data: {booking_data.model_dump_json()}"
+                f"Error booking slot: {e}; response: {response.text}; booking data: {content.decode()}"
             ) from e
         return response.json()
 
     async def close(self) -> None:
-        """Close the client."""
-        await self.client.aclose()
+        """Close the client, unless its HTTP client is shared with another USCClient."""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def get_matching_slot(self, date: datetime) -> Optional[BookableSlot]:
         """Get the first matching slot for a date.
@@ -483,24 +581,26 @@ class USCClient:
         Returns:
             Dict[str, List[BookableSlot]]: Grouped slots, sorted by start date
         """
-        grouped = {}
-        from_time = datetime.strptime(self.FROM_TIME, "%H:%M:%S.%f").time()
-        until_time = datetime.strptime(self.UNTIL_TIME, "%H:%M:%S.%f").time()
+        grouped: defaultdict[str, List[BookableSlot]] = defaultdict(list)
+        from_time = self.FROM_TIME_OF_DAY
+        until_time = self.UNTIL_TIME_OF_DAY
         for slot in slots:
             if not slot.isAvailable:
                 continue
-            copiedSlot = slot.model_copy()
-            copiedSlot.startDate = offset_slot_date(copiedSlot.startDate)
-            copiedSlot.endDate = offset_slot_date(copiedSlot.endDate)
 
             # Filter out slots that are not in the range of start/end times
-            slot_time = copiedSlot.startDate.time()
+            # before anything is copied
+            start_date = offset_slot_date(slot.startDate)
+            slot_time = start_date.time()
             if slot_time < from_time or slot_time > until_time:
                 continue
 
-            if _to_dict_key(copiedSlot.startDate) not in grouped:
-                grouped[_to_dict_key(copiedSlot.startDate)] = []
-            grouped[_to_dict_key(copiedSlot.startDate)].append(copiedSlot)
+            # The dates are already valid, so the copy doesn't need validation
+            grouped[_to_dict_key(start_date)].append(
+                slot.model_copy(
+                    update={"startDate": start_date, "endDate": offset_slot_date(slot.endDate)}
+                )
+            )
         return dict(sorted(grouped.items()))
 
 
@@ -522,7 +622,8 @@ def offset_slot_date(date: datetime) -> datetime:
 
 def _to_dict_key(date: datetime) -> str:
     """Convert a datetime to a dict key. Useful for grouping slots by date without timezone."""
-    return date.strftime("%Y-%m-%d %H:%M")
+    # Keys are the formatted slot dates, so a time entered in chat matches its slot
+    return format_slot_date(date)
 
 
 def format_slot_date(date: datetime) -> str:
@@ -534,7 +635,44 @@ def format_slot_date(date: datetime) -> str:
     Returns:
         str: Formatted date
     """
-    return date.strftime("%Y-%m-%d %H:%M")
+    # Same as strftime("%Y-%m-%d %H:%M"), without going through the C library's strftime
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d} {date.hour:02d}:{date.minute:02d}"
+
+
+def parse_date(date: str, settings: Optional[Dict[str, Any]] = None) -> Optional[datetime]:
+    """Parse a date string, including natural language dates like "6 days later".
+
+    ISO 8601 dates are parsed with datetime.fromisoformat and dates in one of the
+    CHAT_DATE_FORMATS with strptime. Other dates fall back to dateparser, which compiles its
+    locale data when it is imported. That takes a noticeable part of the bot's startup time,
+    so it is only imported on first use.
+
+    Args:
+        date: Date string
+        settings: Optional dateparser settings
+
+    Returns:
+        Optional[datetime]: Parsed date, naive unless the date string includes a UTC offset,
+            or None if the date could not be parsed
+    """
+    stripped_date = date.strip()
+    try:
+        return datetime.fromisoformat(stripped_date)
+    except ValueError:
+        pass
+
+    # strptime also accepts single digit hours like "2024-03-20 8:00"
+    for date_format in CHAT_DATE_FORMATS:
+        try:
+            return datetime.strptime(stripped_date, date_format)
+        except ValueError:
+            pass
+
+    from dateparser import parse
+
+    # Chat input is English, pinning the language skips dateparser's language detection
+    parsed_date: Optional[datetime] = parse(date, languages=DATEPARSER_LANGUAGES, settings=settings)
+    return parsed_date
 
 
 def _parse_ams_date(date: str | datetime) -> datetime:
@@ -547,11 +685,11 @@ def _parse_ams_date(date: str | datetime) -> datetime:
         datetime: Amsterdam timezone datetime
     """
     if isinstance(date, str):
-        parsed_date = parse(date, settings={"TIMEZONE": "Europe/Amsterdam"})
+        parsed_date = parse_date(date, settings={"TIMEZONE": "Europe/Amsterdam"})
         if not parsed_date:
             raise RuntimeError(f"Failed to parse date '{date}'")
-        return parsed_date.replace(tzinfo=AMSTERDAM_TZ)
-    elif date.tzinfo is None:
+        date = parsed_date
+
+    if date.tzinfo is None:
         return date.replace(tzinfo=AMSTERDAM_TZ)
-    else:
-        return date
+    return date.astimezone(AMSTERDAM_TZ)